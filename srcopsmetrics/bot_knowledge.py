@@ -18,14 +18,17 @@
 """Create, Visualize, Use bot knowledge from different Software Development Platforms."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from importlib import import_module
 from pathlib import Path
 from pkgutil import iter_modules
-from typing import List, Optional
+from typing import List, Optional, Type
 
 from srcopsmetrics.entities import Entity, NOT_FOR_INSPECTION
+from srcopsmetrics.entities.interface import wait_for_uploads
 from srcopsmetrics.exceptions import NotKnownEntitiesError
 from srcopsmetrics.github_knowledge import GitHubKnowledge
+from srcopsmetrics.iterator import KnowledgeAnalysis
 from srcopsmetrics import utils
 from srcopsmetrics import entities
 
@@ -35,6 +38,9 @@ import inspect
 
 _LOGGER = logging.getLogger(__name__)
 
+# projects share api.MAX_CONCURRENT_REQUESTS limit of concurrent requests
+MAX_PARALLEL_PROJECTS = 4
+
 github_knowledge = GitHubKnowledge()
 
 
@@ -57,41 +63,67 @@ def _get_all_entities():
     return entities_classes
 
 
+def _analyse_project(repository: str, entities: List[Type[Entity]], is_local: bool = False) -> None:
+    """Run analysis of given entities on a single project."""
+    _LOGGER.info("######################## Analysing %s ########################\n", repository)
+    github_repo = github_handling.connect_to_source(repository)
+
+    path = Path.cwd().joinpath("./srcopsmetrics/bot_knowledge")
+    project_path = path.joinpath("./" + github_repo.full_name)
+    utils.check_directory(project_path)
+
+    for entity in entities:
+        if KnowledgeAnalysis.interrupted.is_set():
+            return
+
+        _LOGGER.info("%s inspection", entity.__name__)
+        github_knowledge.analyse_entity(
+            github_repo=github_repo, project_path=project_path, entity_cls=entity, is_local=is_local
+        )
+        _LOGGER.info("\n")
+
+
 def analyse_projects(repositories: List[str], is_local: bool = False, entities: Optional[List[str]] = None) -> None:
     """Run Issues (that are not PRs), PRs, PR Reviews analysis on specified projects.
 
+    Projects are analysed concurrently, as the analysis is mostly waiting for GitHub API responses.
+
     Arguments:
         projects {List[Tuple[str, str]]} -- one tuple should be in format (project_name, repository_name)
         is_local {bool} -- if set to False, Ceph will be used
         entities {Optional[List[str]]} -- entities that will be analysed. If not specified, all are used.
 
     """
-    path = Path.cwd().joinpath("./srcopsmetrics/bot_knowledge")
-    for repo in repositories:
-        _LOGGER.info("######################## Analysing %s ########################\n" % repo)
-        github_repo = github_handling.connect_to_source(repo)
-
-        project_path = path.joinpath("./" + github_repo.full_name)
-        utils.check_directory(project_path)
-
-        allowed_entities = _get_all_entities()
-
-        specified_entities = []
-        if entities:
-            specified_entities = [e for e in allowed_entities if e.__name__ in entities]
-            if specified_entities == []:
-                raise NotKnownEntitiesError(
-                    message="", specified_entities=entities, available_entities=allowed_entities
-                )
-
-        inspected_entities = specified_entities or allowed_entities
-
-        for entity in inspected_entities:
-            _LOGGER.info("%s inspection" % entity.__name__)
-            github_knowledge.analyse_entity(
-                github_repo=github_repo, project_path=project_path, entity_cls=entity, is_local=is_local
-            )
-            _LOGGER.info("\n")
+    allowed_entities = _get_all_entities()
+
+    specified_entities = []
+    if entities:
+        specified_entities = [e for e in allowed_entities if e.__name__ in entities]
+        if specified_entities == []:
+            raise NotKnownEntitiesError(message="", specified_entities=entities, available_entities=allowed_entities)
+
+    inspected_entities = specified_entities or allowed_entities
+
+    KnowledgeAnalysis.interrupted.clear()
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(MAX_PARALLEL_PROJECTS, len(repositories))))
+    futures = [executor.submit(_analyse_project, repo, inspected_entities, is_local) for repo in repositories]
+    failed = True
+    try:
+        for future in futures:
+            future.result()  # the first failed analysis is raised
+        failed = False
+    except KeyboardInterrupt:
+        _LOGGER.warning("Analysis interrupted, cached data of running projects will be saved")
+        KnowledgeAnalysis.interrupted.set()
+        raise
+    finally:
+        # not started projects are cancelled, running ones stop on failure or interruption after saving knowledge
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+        # upload errors are only logged not to replace the analysis failure being raised
+        wait_for_uploads(raise_error=not failed)
 
 
 def visualize_project_results(project: str, is_local: bool = False):
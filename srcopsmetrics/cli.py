@@ -83,6 +83,17 @@ def get_entities_as_list(entities_raw: Optional[str]) -> List[str]:
     is_flag=True,
     help="Use local for knowledge loading and storing.",
 )
+@click.option(
+    "--with-commits",
+    is_flag=True,
+    help="List commits of every analysed pull request, only the number of commits is collected otherwise.",
+)
+@click.option(
+    "--full-scan",
+    is_flag=True,
+    help="""List all of the entities of repository to find the ones missing in knowledge.
+            By default only entities created after the newest known one are analysed.""",
+)
 @click.option(
     "--entities",
     "-e",
@@ -150,6 +161,8 @@ def cli(
     create_knowledge: bool,
     process_knowledge: bool,
     is_local: bool,
+    with_commits: bool,
+    full_scan: bool,
     entities: Optional[str],
     visualize_statistics: bool,
     reviewer_reccomender: bool,
@@ -161,6 +174,8 @@ def cli(
 ):
     """Command Line Interface for SrcOpsMetrics."""
     os.environ["IS_LOCAL"] = "True" if is_local else "False"
+    os.environ["WITH_COMMITS"] = "True" if with_commits else "False"
+    os.environ["FULL_SCAN"] = "True" if full_scan else "False"
     os.environ[StoragePath.LOCATION_VAR.value] = knowledge_path
     os.environ[StoragePath.MERGE_LOCATION_ENVVAR_NAME.value] = merge_path
 
@@ -187,7 +202,7 @@ def cli(
         _LOGGER.info("#### Launching thoth data analysis ####")
         if repository and not merge:
             for repo in repos:
-                _LOGGER.info("Creating metrics for repository %s" % repo)
+                _LOGGER.info("Creating metrics for repository %s", repo)
                 kebechet_metrics = KebechetMetrics(repository=repo, day=yesterday, is_local=is_local)
                 kebechet_metrics.evaluate_and_store_kebechet_metrics()
 
@@ -208,7 +223,7 @@ def cli(
 
     if merge:
         if thoth:
-            _LOGGER.info("Merging kebechet metrics for %s" % yesterday)
+            _LOGGER.info("Merging kebechet metrics for %s", yesterday)
             KebechetMetrics.merge_kebechet_metrics_per_day(day=yesterday, is_local=is_local)
         else:
             raise NotImplementedError
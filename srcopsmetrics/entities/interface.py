@@ -18,11 +18,15 @@
 
 """Entity interface class."""
 
+import itertools
 import logging
 import os
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
-from typing import Collection, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 import pandas as pd
 from github.Repository import Repository
@@ -30,22 +34,66 @@ from voluptuous.error import MultipleInvalid
 from voluptuous.schema_builder import Schema
 
 from srcopsmetrics import github_handling, utils
-from srcopsmetrics.entities.tools.storage import KnowledgeStorage
+from srcopsmetrics.entities.tools.storage import KnowledgeStorage, dumps
 from srcopsmetrics.enums import StoragePath
 
 _LOGGER = logging.getLogger(__name__)
 
+_ENTITIES_SCHEMAS: "WeakKeyDictionary[type, Schema]" = WeakKeyDictionary()
+
+# local knowledge file is rewritten without superseded records once they make up this part of its lines
+COMPACTION_RATIO = 0.3
+
+_UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+_PENDING_UPLOADS: List[Future] = []
+
+
+def _store_on_ceph(lines: Iterable[bytes], ceph_filename: str):
+    """Store knowledge lines as a document on Ceph."""
+    s3 = KnowledgeStorage().get_ceph_store()
+    s3.store_document(b"".join(lines).decode(), ceph_filename)
+    _LOGGER.info("Saved on CEPH at %s/%s%s", s3.bucket, s3.prefix, ceph_filename)
+
+
+def _to_lines(entities: Iterable[Tuple[Any, Dict[str, Any]]]) -> Iterator[bytes]:
+    """Encode entities as knowledge lines.
+
+    Index labels are not preserved with records encoding, therefore index is duplicated as id. Ids of previous
+    knowledge are loaded as numbers if possible, so all of them are written as strings like the stored entities.
+    """
+    for entity_id, record in entities:
+        yield dumps({**record, "id": str(entity_id)}) + b"\n"
+
+
+def wait_for_uploads(raise_error: bool = True):
+    """Wait until all of the knowledge uploads to Ceph are finished.
+
+    Upload errors are logged, the first one is raised afterwards if raise_error is set.
+    """
+    error: Optional[BaseException] = None
+    while _PENDING_UPLOADS:
+        upload_error = _PENDING_UPLOADS.pop(0).exception()
+        if upload_error is not None:
+            _LOGGER.error("Knowledge upload to Ceph failed: %s", upload_error, exc_info=upload_error)
+            error = error or upload_error
+
+    if error is not None and raise_error:
+        raise error
+
 
 class Entity(metaclass=ABCMeta):
     """This class defines interface every entity class should implement."""
 
+    # stored entities are validated against entities schema before save only for debugging purposes
+    VALIDATE_ON_SAVE = os.getenv("SRCOPSMETRICS_VALIDATE") == "1"
+
     def __init__(self, repository: Optional[Repository] = None, repository_name: Optional[str] = None):
         """Initialize entity with github repository.
 
         Every entity should be initialized just with the repository name.
         """
-        self.stored_entities = self.entities_schema()({})
-        self.previous_knowledge = self.entities_schema()({})
+        self.stored_entities: Dict[Any, Any] = {}
+        self.previous_knowledge: Any = {}
 
         if repository_name:
             self.repository_name = repository_name
@@ -58,6 +106,8 @@ class Entity(metaclass=ABCMeta):
         if not repository:
             self.repository = github_handling.connect_to_source(repository_name)
 
+        utils.check_directory(self.file_path.parent)
+
     @classmethod
     def name(cls) -> str:
         """Entity name as defined in GitHub API documentation.
@@ -84,11 +134,14 @@ class Entity(metaclass=ABCMeta):
 
     @classmethod
     def entities_schema(cls) -> Schema:
-        """Return schema of how all of the entities of repo are stored."""
-        return Schema({str: cls.entity_schema})
+        """Return schema of how all of the entities of repo are stored, built once per entity class."""
+        schema = _ENTITIES_SCHEMAS.get(cls)
+        if schema is None:
+            schema = _ENTITIES_SCHEMAS[cls] = Schema({str: cls.entity_schema})
+        return schema
 
     @abstractmethod
-    def analyse(self) -> Collection:
+    def analyse(self) -> Iterable:
         """Gather list of all entities that are later analysed using store method.
 
         :rtype: gathered list
@@ -101,20 +154,23 @@ class Entity(metaclass=ABCMeta):
         All the stored entities are then retrieved by stored_entities function.
         """
 
-    @property
+    @cached_property
     def file_path(self) -> Path:
-        """Get entity file path."""
+        """Get entity file path, it is resolved once as repository name does not change."""
         path = Path.cwd().joinpath(os.getenv(StoragePath.LOCATION_VAR.value, StoragePath.DEFAULT.value))
         path = path.joinpath(StoragePath.KNOWLEDGE.value)
 
         project_path = path.joinpath("./" + self.repository_name)
-        utils.check_directory(project_path)
 
         appendix = ".json"  # if as_csv else ".json" TODO implement as_csv bool
         return project_path.joinpath("./" + self.filename + appendix)
 
     def save_knowledge(self, file_path: Path = None, is_local: bool = False, as_csv: bool = False):
-        """Save collected knowledge as json."""
+        """Save collected knowledge as json.
+
+        New entities are appended to the local knowledge file, records of entities stored again supersede the
+        previous ones. The whole file is rewritten only once superseded records exceed :data:`COMPACTION_RATIO`.
+        """
         if self.stored_entities is None or len(self.stored_entities) == 0:
             _LOGGER.info("Nothing to store.")
             _LOGGER.info("\n")
@@ -123,47 +179,68 @@ class Entity(metaclass=ABCMeta):
         if not file_path:
             file_path = self.file_path
 
-        try:
-            self.entities_schema()(self.stored_entities)  # check for entities schema
-        except MultipleInvalid as e:
-            _LOGGER.warning("Data found to be inconsistent with its schema, original message:")
-            _LOGGER.warning(str(e))
-
-        new_data = pd.DataFrame.from_dict(self.stored_entities).T
-        to_save = pd.concat([new_data, self.previous_knowledge])
+        if self.VALIDATE_ON_SAVE:
+            try:
+                self.entities_schema()(self.stored_entities)  # check for entities schema
+            except MultipleInvalid as e:
+                _LOGGER.warning("Data found to be inconsistent with its schema, original message:")
+                _LOGGER.warning(str(e))
 
         _LOGGER.info("Knowledge file %s", (os.path.basename(file_path)))
         _LOGGER.info("new %d entities", len(self.stored_entities))
-        _LOGGER.info("(overall %d entities)", len(to_save))
+        _LOGGER.info("(overall %d entities)", len(self.stored_entities) + len(self.previous_knowledge))
 
+        lines: Iterable[bytes]
+        append = False
         if as_csv:
-            to_save = to_save.to_csv()
+            new_data = pd.DataFrame.from_dict(self.stored_entities).T
+            lines = [pd.concat([new_data, self.previous_knowledge]).to_csv().encode()]
         else:
-            # index labels not preserved with records encoding
-            # therefore duplicating index column
-            to_save["id"] = to_save.index
-            to_save = to_save.to_json(orient="records", lines=True)
+            lines = _to_lines(self.stored_entities.items())
+
+            previous_stale_lines = self.previous_knowledge.attrs.get("stale_lines", 0)
+            superseded = self.previous_knowledge.index.astype(str).isin(list(self.stored_entities))
+            stale_lines = previous_stale_lines + superseded.sum()
+            total_lines = previous_stale_lines + len(self.previous_knowledge.index) + len(self.stored_entities)
+
+            append = (
+                is_local
+                and file_path == self.file_path
+                and stale_lines <= COMPACTION_RATIO * total_lines
+                # dates of previous knowledge not stored in seconds are normalised by rewriting it
+                and not self.previous_knowledge.attrs.get("converted_dates", False)
+            )
+            if not append:
+                previous_knowledge = self.previous_knowledge[~superseded]
+                previous = zip(previous_knowledge.index, previous_knowledge.to_dict(orient="records"))
+                lines = itertools.chain(_to_lines(previous), lines)
 
         if not is_local:
+            # upload in background so it overlaps with analysis of the next entity, see wait_for_uploads
             ceph_filename = os.path.relpath(file_path).replace("./", "")
-            s3 = KnowledgeStorage().get_ceph_store()
-            s3.store_document(to_save, ceph_filename)
-            _LOGGER.info("Saved on CEPH at %s/%s%s" % (s3.bucket, s3.prefix, ceph_filename))
+            _PENDING_UPLOADS.append(_UPLOAD_EXECUTOR.submit(_store_on_ceph, lines, ceph_filename))
+        elif append:
+            with open(file_path, "ab") as f:
+                f.writelines(lines)
+            _LOGGER.info("Appended locally to %s", file_path)
         else:
-            with open(file_path, "w") as f:
-                f.write(str(to_save))
-            _LOGGER.info("Saved locally at %s" % file_path)
+            # write records one by one, replace the knowledge file only once all of them are written
+            tmp_path = Path(f"{file_path}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.writelines(lines)
+            os.replace(tmp_path, file_path)
+            _LOGGER.info("Saved locally at %s", file_path)
 
     def load_previous_knowledge(self, is_local: bool = False) -> pd.DataFrame:
         """Load previously collected repo knowledge. If a repo was not inspected before, create its directory."""
         df = KnowledgeStorage(is_local=is_local).load_data(self.file_path)
 
         if df.empty:
-            _LOGGER.info("No previous knowledge of type %s found" % self.name())
+            _LOGGER.info("No previous knowledge of type %s found", self.name())
             return pd.DataFrame()
 
         _LOGGER.info(
-            "Found previous %s knowledge for %s with %d records" % (self.name(), self.repository_name, len(df.index))
+            "Found previous %s knowledge for %s with %d records", self.name(), self.repository_name, len(df.index)
         )
         return df
 
@@ -181,16 +258,13 @@ class Entity(metaclass=ABCMeta):
             List[PaginatedList] -- filtered new data without the old ones
 
         """
-        old_knowledge_ids = self.previous_knowledge.index
-        _LOGGER.debug("Currently gathered ids %s" % old_knowledge_ids)
-
-        new_data = self.get_raw_github_data()
-
-        new_knowledge_ids = [entity.number for entity in new_data]
+        old_knowledge_ids = frozenset(self.previous_knowledge.index.astype(int))
+        _LOGGER.debug("Currently gathered ids %s", old_knowledge_ids)
 
-        only_new_ids = set(new_knowledge_ids) - set(old_knowledge_ids)
-        if len(only_new_ids) == 0:
+        # single pass, raw data may be lazily paginated
+        only_new = [entity for entity in self.get_raw_github_data() if entity.number not in old_knowledge_ids]
+        if len(only_new) == 0:
             _LOGGER.info("No new knowledge found for update")
         else:
-            _LOGGER.debug("New ids to be examined are %s" % only_new_ids)
-        return [x for x in new_data if x.number in only_new_ids]
+            _LOGGER.info("Updating with %d new entities", len(only_new))
+        return only_new
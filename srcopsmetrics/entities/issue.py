@@ -19,7 +19,9 @@
 """Issue entity class."""
 
 import logging
+import os
 
+from github.GithubObject import NotSet
 from github.Issue import Issue as GithubIssue
 from github.PaginatedList import PaginatedList
 from voluptuous.schema_builder import Schema
@@ -67,9 +69,15 @@ class Issue(Entity):
             "closed_by": issue.closed_by.login if issue.closed_by is not None else None,
             "closed_at": int(issue.closed_at.timestamp()) if issue.closed_at is not None else None,
             "labels": GitHubKnowledge.get_labels(issue),
-            "interactions": GitHubKnowledge.get_interactions(issue.get_comments()),
+            "interactions": GitHubKnowledge.get_interactions((c.user.login, c.body) for c in issue.get_comments()),
         }
 
     def get_raw_github_data(self):
         """Override :func:`~Entity.get_raw_github_data`."""
-        return [issue for issue in self.repository.get_issues(state="all") if not issue.pull_request]
+        # issues created after the newest known one were updated after it too,
+        # knowledge not collected from the oldest issue is completed by full scan
+        since = NotSet
+        if not self.previous_knowledge.empty and os.getenv("FULL_SCAN") != "True":
+            since = self.previous_knowledge["created_at"].max()
+        issues = self.repository.get_issues(state="all", sort="created", direction="asc", since=since)
+        return [issue for issue in issues if not issue.pull_request]
@@ -94,7 +94,7 @@ class KebechetUpdateManager(Entity):
             if keyword in issue.title:
                 return request_type
 
-        _LOGGER.debug(f"Update request not recognized, issue num.{issue.number}")
+        _LOGGER.debug("Update request not recognized, issue num.%d", issue.number)
         return None
 
     @staticmethod
@@ -18,35 +18,189 @@
 
 """Pull Request entity class."""
 
+import asyncio
 import logging
-from typing import Dict, Generator, List, Optional
+import os
+from datetime import datetime, timedelta
+from typing import Any, Collection, Dict, Generator, Iterator, List, Optional
 
-from github.PaginatedList import PaginatedList
+import aiohttp
+import pandas as pd
 from github.PullRequest import PullRequest as GithubPullRequest
 from voluptuous.schema_builder import Schema
-from voluptuous.validators import Any
+from voluptuous import validators
 
 from srcopsmetrics.entities import Entity
+from srcopsmetrics.entities.tools import api
 from srcopsmetrics.entities.tools.knowledge import GitHubKnowledge
 
 _LOGGER = logging.getLogger(__name__)
 
-PullRequestReview = Schema({"author": Any(None, str), "words_count": int, "submitted_at": int, "state": str})
+PullRequestReview = Schema({"author": validators.Any(None, str), "words_count": int, "submitted_at": int, "state": str})
 PullRequestReviews = Schema({str: PullRequestReview})
 
 ISSUE_KEYWORDS = {"close", "closes", "closed", "fix", "fixes", "fixed", "resolve", "resolves", "resolved"}
 
+GRAPHQL_BATCH_SIZE = 50
+
+# GraphQL returns no author of deleted accounts, REST API shows them as this user
+GHOST_LOGIN = "ghost"
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+PULL_REQUEST_NUMBERS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: 100, after: $cursor, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { number }
+    }
+  }
+}
+"""
+
+PULL_REQUEST_FRAGMENT = """
+fragment pullRequestFields on PullRequest {
+  number title body createdAt closedAt mergedAt additions deletions changedFiles
+  author { login }
+  mergedBy { login }
+  timelineItems(itemTypes: [CLOSED_EVENT], last: 1) { nodes { ... on ClosedEvent { actor { login } } } }
+  labels(first: 100) { nodes { name } }
+  reviews(first: 100) { pageInfo { hasNextPage } nodes { databaseId author { login } body submittedAt state } }
+  commits { totalCount }
+}
+"""
+
+
+def get_review_times(pull_requests: List[Dict[str, Any]]) -> Dict[int, Dict[str, Optional[int]]]:
+    """Return timestamps of the first review and the first approve of fetched pull requests by their number.
+
+    All of the reviews are processed at once in a single DataFrame grouped by the pull request number.
+    """
+    reviews = pd.json_normalize(pull_requests, record_path="reviews", meta=[["pull", "number"]])
+    if reviews.empty:
+        return {}
+
+    submitted_at = pd.to_datetime(reviews["submittedAt"], utc=True) - pd.Timestamp(0, tz="UTC")
+    reviews["submitted_at"] = submitted_at // pd.Timedelta(seconds=1)
+
+    first_reviews = reviews.groupby("pull.number")["submitted_at"].min()
+    first_approves = reviews[reviews["state"] == "APPROVED"].groupby("pull.number")["submitted_at"].min()
+
+    times = pd.DataFrame({"first_review_at": first_reviews, "first_approve_at": first_approves}).astype("Int64")
+    return times.astype(object).where(times.notna(), None).to_dict(orient="index")
+
+
+def get_timestamp(value: Optional[str]) -> Optional[int]:
+    """Convert GitHub ISO 8601 datetime string to timestamp.
+
+    GitHub datetimes are always in UTC as YYYY-MM-DDTHH:MM:SSZ, so they are parsed with the much faster
+    :meth:`datetime.fromisoformat` instead of :meth:`datetime.strptime`.
+    """
+    if value is None:
+        return None
+    return (datetime.fromisoformat(value[:-1]) - _EPOCH) // _SECOND
+
+
+async def _get_new_pull_request_numbers(
+    session: aiohttp.ClientSession, owner: str, name: str, known: Collection[int], full_scan: bool = False
+) -> List[int]:
+    """Get numbers of pull requests of repository created after the newest known one, oldest first.
+
+    Pull requests are listed from the newest one and paging stops at the first known pull request.
+    New pull requests are analysed from the oldest one, so everything created before a known one is known too.
+    Knowledge collected otherwise may miss older pull requests, full scan lists all of them and skips the known.
+    """
+    numbers: List[int] = []
+    cursor = None
+    while True:
+        data = await api.graphql_query(session, PULL_REQUEST_NUMBERS_QUERY, owner=owner, name=name, cursor=cursor)
+        pull_requests = data["repository"]["pullRequests"]
+        for node in pull_requests["nodes"]:
+            if node["number"] not in known:
+                numbers.append(node["number"])
+            elif not full_scan:
+                return numbers[::-1]
+
+        if not pull_requests["pageInfo"]["hasNextPage"]:
+            return numbers[::-1]
+        cursor = pull_requests["pageInfo"]["endCursor"]
+
+
+async def _get_pull_requests(
+    session: aiohttp.ClientSession, owner: str, name: str, numbers: List[int]
+) -> List[Dict[str, Any]]:
+    """Get pull requests with given numbers in a single GraphQL query."""
+    pull_requests = "\n".join(
+        f"pr_{number}: pullRequest(number: {number}) {{ ...pullRequestFields }}" for number in numbers
+    )
+    query = f"""
+query($owner: String!, $name: String!) {{
+  repository(owner: $owner, name: $name) {{
+    {pull_requests}
+  }}
+}}
+{PULL_REQUEST_FRAGMENT}"""
+    data = await api.graphql_query(session, query, owner=owner, name=name)
+    return [data["repository"][f"pr_{number}"] for number in numbers]
+
+
+async def _no_commits() -> List[Dict[str, Any]]:
+    return []
+
+
+async def fetch_pull(
+    session: aiohttp.ClientSession,
+    owner: str,
+    name: str,
+    pull: Dict[str, Any],
+    with_commits: bool = False,
+) -> Dict[str, Any]:
+    """Fetch resources of pull request that are not part of the GraphQL query concurrently.
+
+    Commits are listed only if requested, their number is already part of the GraphQL query.
+    """
+    url = f"{api.GITHUB_API_URL}/repos/{owner}/{name}"
+    number = pull["number"]
+
+    comments, commits, files = await asyncio.gather(
+        api.get_all(session, f"{url}/issues/{number}/comments"),
+        api.get_all(session, f"{url}/pulls/{number}/commits") if with_commits else _no_commits(),
+        api.get_all(session, f"{url}/pulls/{number}/files"),
+    )
+
+    reviews = pull["reviews"]["nodes"]
+    if pull["reviews"]["pageInfo"]["hasNextPage"]:
+        reviews = [
+            {
+                "databaseId": review["id"],
+                "author": review["user"],
+                "body": review["body"],
+                "submittedAt": review["submitted_at"],
+                "state": review["state"],
+            }
+            for review in await api.get_all(session, f"{url}/pulls/{number}/reviews")
+        ]
+
+    return {"pull": pull, "reviews": reviews, "comments": comments, "commits": commits, "files": files}
+
+
+async def _collect_new_numbers(repository_name: str, known: Collection[int], full_scan: bool = False) -> List[int]:
+    """Get numbers of pull requests of repository that are not known yet, oldest first."""
+    owner, name = repository_name.split("/")
+
+    async with api.create_session() as session:
+        return await _get_new_pull_request_numbers(session, owner, name, known, full_scan=full_scan)
 
-def get_first_review_time(reviews: Dict[Any, Any]) -> Optional[int]:
-    """Return timestamp of the first PR review."""
-    rev_times = [int(rev["submitted_at"]) for rev in reviews.values()]
-    return min(rev_times) if rev_times else None
 
+async def _collect(repository_name: str, numbers: List[int], with_commits: bool = False) -> List[Dict[str, Any]]:
+    """Fetch pull requests of repository with given numbers."""
+    owner, name = repository_name.split("/")
 
-def get_approve_time(reviews: Dict[Any, Any]) -> Optional[int]:
-    """Return timestamp of the first PR approve review."""
-    approvals = [rev["submitted_at"] for rev in reviews.values() if rev["state"] == "APPROVED"]
-    return min(approvals) if approvals else None
+    async with api.create_session() as session:
+        pulls = await _get_pull_requests(session, owner, name, numbers)
+        return await asyncio.gather(*[fetch_pull(session, owner, name, pull, with_commits) for pull in pulls])
 
 
 class PullRequest(Entity):
@@ -55,15 +209,15 @@ class PullRequest(Entity):
     entity_schema = Schema(
         {
             "title": str,
-            "body": Any(None, str),
+            "body": validators.Any(None, str),
             "size": str,
             "labels": [str],
             "created_by": str,
             "created_at": int,
-            "closed_at": Any(None, int),
-            "closed_by": Any(None, str),
-            "merged_at": Any(None, int),
-            "merged_by": Any(None, str),
+            "closed_at": validators.Any(None, int),
+            "closed_by": validators.Any(None, str),
+            "merged_at": validators.Any(None, int),
+            "merged_by": validators.Any(None, str),
             "commits_number": int,
             "changed_files": [str],
             "changed_files_number": int,
@@ -71,31 +225,44 @@ class PullRequest(Entity):
             "reviews": PullRequestReviews,
             "commits": [str],
             "files": [str],
-            "first_review_at": Any(None, int),
-            "first_approve_at": Any(None, int),
+            "first_review_at": validators.Any(None, int),
+            "first_approve_at": validators.Any(None, int),
         }
     )
 
-    def analyse(self) -> PaginatedList:
-        """Override :func:`~Entity.analyse`."""
-        return self.get_raw_github_data()
+    def analyse(self) -> Iterator[Dict[str, Any]]:
+        """Override :func:`~Entity.analyse`.
 
-    def store(self, pull_request: GithubPullRequest):
+        Pull requests are fetched and yielded by batches from the oldest one, so the already fetched ones
+        can be stored even if fetching of the later ones fails.
+        """
+        full_scan = os.getenv("FULL_SCAN") == "True"
+        numbers = asyncio.run(
+            _collect_new_numbers(self.repository_name, known=self.previous_knowledge.index, full_scan=full_scan)
+        )
+        _LOGGER.info("Fetching %d new pull requests", len(numbers))
+
+        with_commits = os.getenv("WITH_COMMITS") == "True"
+        for idx in range(0, len(numbers), GRAPHQL_BATCH_SIZE):
+            pull_requests = asyncio.run(
+                _collect(self.repository_name, numbers[idx : idx + GRAPHQL_BATCH_SIZE], with_commits=with_commits)
+            )
+
+            review_times = get_review_times(pull_requests)
+            for pull_request in pull_requests:
+                times = review_times.get(
+                    pull_request["pull"]["number"], {"first_review_at": None, "first_approve_at": None}
+                )
+                pull_request.update(times)
+
+            yield from pull_requests
+
+    def store(self, pull_request: Dict[str, Any]):
         """Override :func:`~Entity.store`."""
-        _LOGGER.info("Extracting PR #%d", pull_request.number)
-
-        if pull_request.number in self.previous_knowledge.index:
-            _LOGGER.debug("PullRequest %s already analysed, skipping")
-            return
-
-        created_at = int(pull_request.created_at.timestamp())
-        closed_at = int(pull_request.closed_at.timestamp()) if pull_request.closed_at is not None else None
-        merged_at = int(pull_request.merged_at.timestamp()) if pull_request.merged_at is not None else None
+        pull = pull_request["pull"]
+        _LOGGER.info("Extracting PR #%d", pull["number"])
 
-        closed_by = pull_request.as_issue().closed_by.login if pull_request.as_issue().closed_by is not None else None
-        merged_by = pull_request.merged_by.login if pull_request.merged_by is not None else None
-
-        labels = [label.name for label in pull_request.get_labels()]
+        labels = [label["name"] for label in pull["labels"]["nodes"]]
 
         # Evaluate size of PR
         pull_request_size = None
@@ -103,30 +270,37 @@ class PullRequest(Entity):
             pull_request_size = GitHubKnowledge.get_labeled_size(labels)
 
         if not pull_request_size:
-            lines_changes = pull_request.additions + pull_request.deletions
+            lines_changes = pull["additions"] + pull["deletions"]
             pull_request_size = GitHubKnowledge.assign_pull_request_size(lines_changes=lines_changes)
 
-        reviews = self.extract_pull_request_reviews(pull_request)
+        reviews = self.extract_pull_request_reviews(pull_request["reviews"])
+
+        interactions = GitHubKnowledge.get_interactions(
+            (comment["user"]["login"], comment["body"]) for comment in pull_request["comments"]
+        )
+
+        closed_events = pull["timelineItems"]["nodes"]
+        closed_by = closed_events[0]["actor"] if pull["closedAt"] is not None and closed_events else None
 
-        self.stored_entities[str(pull_request.number)] = {
-            "title": pull_request.title,
-            "body": pull_request.body,
+        self.stored_entities[str(pull["number"])] = {
+            "title": pull["title"],
+            "body": pull["body"],
             "size": pull_request_size,
-            "created_by": pull_request.user.login,
-            "created_at": created_at,
-            "closed_at": closed_at,
-            "closed_by": closed_by,
-            "merged_at": merged_at,
-            "merged_by": merged_by,
-            "commits_number": pull_request.commits,
-            "changed_files_number": pull_request.changed_files,
-            "interactions": GitHubKnowledge.get_interactions(pull_request.get_issue_comments()),
+            "created_by": pull["author"]["login"] if pull["author"] is not None else GHOST_LOGIN,
+            "created_at": get_timestamp(pull["createdAt"]),
+            "closed_at": get_timestamp(pull["closedAt"]),
+            "closed_by": closed_by["login"] if closed_by is not None else None,
+            "merged_at": get_timestamp(pull["mergedAt"]),
+            "merged_by": pull["mergedBy"]["login"] if pull["mergedBy"] is not None else None,
+            "commits_number": pull["commits"]["totalCount"],
+            "changed_files_number": pull["changedFiles"],
+            "interactions": interactions,
             "reviews": reviews,
             "labels": labels,
-            "commits": [c.sha for c in pull_request.get_commits()],
-            "changed_files": [f.filename for f in pull_request.get_files()],
-            "first_review_at": get_first_review_time(reviews),
-            "first_approve_at": get_approve_time(reviews),
+            "commits": [c["sha"] for c in pull_request["commits"]],
+            "changed_files": [f["filename"] for f in pull_request["files"]],
+            "first_review_at": pull_request["first_review_at"],
+            "first_approve_at": pull_request["first_approve_at"],
         }
 
     def get_raw_github_data(self):
@@ -155,27 +329,25 @@ class PullRequest(Entity):
         return extracted
 
     @staticmethod
-    def extract_pull_request_reviews(pull_request: GithubPullRequest) -> Dict[str, Dict[str, Any]]:
+    def extract_pull_request_reviews(reviews: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
         """Extract required features for each review from PR.
 
         Arguments:
-            pull_request {PullRequest} -- Pull Request from which the reviews will be extracted
+            reviews {List[Dict[str, Any]]} -- reviews of Pull Request as returned by GitHub GraphQL API
 
         Returns:
             Dict[str, Dict[str, Any]] -- dictionary of extracted reviews. Each review is stored
 
         """
-        reviews = pull_request.get_reviews()
-        _LOGGER.debug("  -num of reviews found: %d" % reviews.totalCount)
+        _LOGGER.debug("  -num of reviews found: %d", len(reviews))
 
         results = {}
-        for idx, review in enumerate(reviews, 1):
-            _LOGGER.info("      -analysing review no. %d/%d" % (idx, reviews.totalCount))
-            results[str(review.id)] = {
-                "author": review.user.login if review.user and review.user.login else None,
-                "words_count": len(review.body.split(" ")),
-                "submitted_at": int(review.submitted_at.timestamp()),
-                "state": review.state,
+        for review in reviews:
+            results[str(review["databaseId"])] = {
+                "author": review["author"]["login"] if review["author"] and review["author"]["login"] else None,
+                "words_count": len(review["body"].split(" ")),
+                "submitted_at": get_timestamp(review["submittedAt"]),
+                "state": review["state"],
             }
         return results
 
@@ -199,7 +371,7 @@ class PullRequest(Entity):
         for id in PullRequest.search_for_references(pull_request.body):
             issues_referenced.append(id)
 
-        _LOGGER.debug("      referenced issues: %s" % issues_referenced)
+        _LOGGER.debug("      referenced issues: %s", issues_referenced)
         return issues_referenced
 
     @staticmethod
@@ -222,12 +394,12 @@ class PullRequest(Entity):
                 ref_issue = referenced_issue_number.replace("#", "")
             else:
                 _LOGGER.info("      ...referenced issue number absent")
-                _LOGGER.debug("      keyword message: %s" % body)
+                _LOGGER.debug("      keyword message: %s", body)
                 return
 
             if not referenced_issue_number.isnumeric():
                 _LOGGER.info("      ...referenced issue number in incorrect format")
                 return
 
-            _LOGGER.info("      ...referenced issue number: %s" % ref_issue)
+            _LOGGER.info("      ...referenced issue number: %s", ref_issue)
             yield ref_issue
@@ -0,0 +1,168 @@
+# Copyright (C) 2020 Dominik Tuchyna
+#
+# This file is part of thoth-station/mi - Meta-information Indicators.
+#
+# thoth-station/mi - Meta-information Indicators is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# thoth-station/mi - Meta-information Indicators is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with thoth-station/mi - Meta-information Indicators.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Asynchronous GitHub REST and GraphQL API access tools."""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+
+import aiohttp
+
+from srcopsmetrics.exceptions import GraphQLQueryError
+
+_LOGGER = logging.getLogger(__name__)
+
+_GITHUB_ACCESS_TOKEN = os.getenv("GITHUB_ACCESS_TOKEN")
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
+MAX_CONCURRENT_REQUESTS = 10
+MAX_RETRIES = 5
+SECONDARY_RATE_LIMIT_WAIT_SECONDS = 60
+
+
+class RequestLimiter:
+    """Limit concurrent requests to GitHub API made from all of the threads and their event loops."""
+
+    def __init__(self, limit: int):
+        """Initialize with the maximal number of concurrent requests."""
+        self._semaphore = threading.BoundedSemaphore(limit)
+        # requests waiting for a slot are queued in a single thread, so they do not block event loops
+        # nor occupy their default executors needed by requests holding the slots
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="request-limiter")
+
+    async def __aenter__(self):
+        """Wait until the request can be made without blocking the event loop."""
+        future = self._executor.submit(self._semaphore.acquire)
+        try:
+            await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # slot acquired for an already cancelled request is released right away
+            future.add_done_callback(lambda f: f.cancelled() or self._semaphore.release())
+            raise
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Release the request slot."""
+        self._semaphore.release()
+
+
+# one access token is shared by all of the analysed repositories, so is the limit of concurrent requests
+REQUEST_LIMITER = RequestLimiter(MAX_CONCURRENT_REQUESTS)
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create session authorized to GitHub API, connections are pooled across all of its requests."""
+    headers = {"Accept": "application/vnd.github.v3+json"}
+    if _GITHUB_ACCESS_TOKEN:
+        headers["Authorization"] = f"token {_GITHUB_ACCESS_TOKEN}"
+
+    return aiohttp.ClientSession(headers=headers)
+
+
+async def _wait_until_api_reset(headers: Mapping[str, str]):
+    """Wait until the GitHub API rate limit is reset."""
+    wait_time = int(headers["X-RateLimit-Reset"]) - int(time.time()) + 60
+    _LOGGER.info("API rate limit REACHED, will now wait for %d minutes", wait_time // 60)
+    await asyncio.sleep(wait_time)
+
+
+async def _get_retry_wait_time(response: aiohttp.ClientResponse, retries: int) -> Optional[int]:
+    """Get seconds to wait before the failed request is retried, None if it should not be retried.
+
+    Secondary rate limits and server errors are retried with exponential backoff unless GitHub
+    states how long to wait in Retry-After header.
+    """
+    if response.status in (403, 429):
+        if "Retry-After" not in response.headers and "rate limit" not in (await response.text()).lower():
+            return None  # e.g. missing permissions
+    elif response.status < 500:
+        return None
+
+    if retries >= MAX_RETRIES:
+        return None
+    if "Retry-After" in response.headers:
+        return int(response.headers["Retry-After"])
+    if response.status >= 500:
+        return 2 ** retries
+    return SECONDARY_RATE_LIMIT_WAIT_SECONDS * 2 ** retries
+
+
+async def _request(
+    session: aiohttp.ClientSession, method: str, url: str, **kwargs: Any
+) -> Tuple[Any, aiohttp.ClientResponse]:
+    """Request GitHub API, return the response json and the response itself.
+
+    Requests are retried once rate limits are regained and on server errors.
+    """
+    retries = 0
+    while True:
+        async with REQUEST_LIMITER:
+            async with session.request(method, url, **kwargs) as response:
+                rate_limited = response.status in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0"
+                wait_time = None if response.ok or rate_limited else await _get_retry_wait_time(response, retries)
+                if wait_time is None and not rate_limited:
+                    response.raise_for_status()
+                    return await response.json(), response
+
+        # request slot is released while waiting, so it does not hold back requests of other threads
+        if rate_limited:
+            await _wait_until_api_reset(response.headers)
+            continue
+
+        _LOGGER.warning("GitHub API responded %d to %s, retrying in %d seconds", response.status, url, wait_time)
+        retries += 1
+        await asyncio.sleep(wait_time)
+
+
+async def get_page(session: aiohttp.ClientSession, url: str) -> Tuple[Any, Optional[str]]:
+    """Get single page of GitHub API resource, return its json and url of the next page."""
+    page, response = await _request(session, "GET", url)
+    next_page = response.links.get("next")
+    return page, str(next_page["url"]) if next_page else None
+
+
+async def get_all(session: aiohttp.ClientSession, url: str, **params: str) -> List[Dict[str, Any]]:
+    """Get all pages of paginated GitHub API resource."""
+    results: List[Dict[str, Any]] = []
+    next_url: Optional[str] = f"{url}?{urlencode({'per_page': 100, **params})}"
+    while next_url:
+        page, next_url = await get_page(session, next_url)
+        results.extend(page)
+    return results
+
+
+async def graphql_query(session: aiohttp.ClientSession, query: str, **variables: Any) -> Dict[str, Any]:
+    """Run GitHub GraphQL API query and return its data."""
+    while True:
+        result, response = await _request(
+            session, "POST", GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables}
+        )
+
+        errors = result.get("errors")
+        if errors and any(error.get("type") == "RATE_LIMITED" for error in errors):
+            await _wait_until_api_reset(response.headers)
+            continue
+
+        if errors:
+            raise GraphQLQueryError("; ".join(error["message"] for error in errors))
+        return result["data"]
@@ -18,18 +18,17 @@
 """Knowledge extraction tools/functions."""
 
 import logging
-import os
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
-from github import Github, PaginatedList
+from github import PaginatedList
 from github.Issue import Issue
 
+from srcopsmetrics.github_handling import GitHubSingleton
+
 _LOGGER = logging.getLogger(__name__)
 
 STANDALONE_LABELS = {"size"}
 
-_GITHUB_ACCESS_TOKEN = os.getenv("GITHUB_ACCESS_TOKEN")
-
 
 class GitHubKnowledge:
     """Class that represents statical tools used in knowledge analysis."""
@@ -44,7 +43,7 @@ class GitHubKnowledge:
         :rtype: List of all repositories (repository + repositories in organization)
         """
         repos = []
-        gh = Github(login_or_token=_GITHUB_ACCESS_TOKEN, timeout=50)
+        gh = GitHubSingleton().github
 
         if repository is not None:
             repos.append(gh.get_repo(repository).full_name)
@@ -56,7 +55,7 @@ class GitHubKnowledge:
             for r in repositories:
                 repos.append(r.full_name)
 
-        _LOGGER.info("Overall repositories found: %d" % len(repos))
+        _LOGGER.info("Overall repositories found: %d", len(repos))
         return repos
 
     @staticmethod
@@ -113,7 +112,7 @@ class GitHubKnowledge:
 
         """
         old_knowledge_ids = [int(id) for id in old_data.keys()]
-        _LOGGER.debug("Currently gathered ids %s" % old_knowledge_ids)
+        _LOGGER.debug("Currently gathered ids %s", old_knowledge_ids)
 
         new_knowledge_ids = [pr.number for pr in new_data]
 
@@ -121,17 +120,20 @@ class GitHubKnowledge:
         if len(only_new_ids) == 0:
             _LOGGER.info("No new knowledge found for update")
         else:
-            _LOGGER.info("Updating with %s new IDs" % len(only_new_ids))
-            _LOGGER.debug("New ids to be examined are %s" % only_new_ids)
+            _LOGGER.info("Updating with %s new IDs", len(only_new_ids))
+            _LOGGER.debug("New ids to be examined are %s", only_new_ids)
         return [x for x in new_data if x.number in only_new_ids]
 
     @staticmethod
-    def get_interactions(comments) -> Dict:
-        """Get overall word count for comments per author."""
-        interactions = {comment.user.login: 0 for comment in comments}
-        for comment in comments:
+    def get_interactions(comments: Iterable[Tuple[str, str]]) -> Dict[str, int]:
+        """Get overall word count for comments per author.
+
+        Comments are passed as pairs of author login and comment body.
+        """
+        interactions: Dict[str, int] = {}
+        for login, body in comments:
             # we count by the num of words in comment
-            interactions[comment.user.login] += len(comment.body.split(" "))
+            interactions[login] = interactions.get(login, 0) + len(body.split(" "))
         return interactions
 
     @staticmethod
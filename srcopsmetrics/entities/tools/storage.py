@@ -17,13 +17,14 @@
 
 """Knowledge storage tools and classes."""
 
+import json
 import logging
 import os
 from pathlib import Path
 from typing import Optional, Dict, Any, Union
 
-import json
-
+import numpy as np
+import orjson
 from thoth.storages.ceph import CephStore
 from thoth.storages.exceptions import NotFoundError
 
@@ -34,21 +35,105 @@ import pandas as pd
 _LOGGER = logging.getLogger(__name__)
 
 
-def load_data_frame(path_or_buf: Union[Path, Any]) -> pd.DataFrame:
-    """Load DataFrame from either string data or path."""
-    df = pd.read_json(path_or_buf, orient="records", lines=True)
-    if not df.empty:
-        df = df.set_index("id")
+def _serialize(obj: Any) -> Any:
+    """Serialize types orjson does not know, timestamps are stored as seconds since epoch."""
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return int(obj.timestamp())
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize data to json, including numpy and pandas types."""
+    return orjson.dumps(data, default=_serialize, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+# numbers in date columns are recognized as dates above the same threshold pandas.read_json uses by default
+_MIN_TIMESTAMP = 31536000
+
+# dates are stored in seconds since epoch, knowledge saved with DataFrame.to_json before has them in milliseconds,
+# larger values are interpreted in the next unit, 10 ** 11 seconds is beyond year 5000
+_SECONDS_BOUNDS = (10 ** 11, 10 ** 14, 10 ** 17)
+_SECONDS_DIVISORS = (1, 10 ** 3, 10 ** 6)
+
+
+def _is_date_column(column: str) -> bool:
+    """Check whether column holds dates by its name."""
+    return (
+        column.endswith("_at")
+        or column.endswith("_time")
+        or column.startswith("timestamp")
+        or column in ("modified", "date", "datetime")
+    )
+
+
+def _to_seconds(data: pd.Series) -> pd.Series:
+    """Convert epoch timestamps to seconds, unit of every value is detected by its magnitude.
+
+    Values in seconds, milliseconds, microseconds and nanoseconds can be mixed within the data.
+    """
+    divisors = np.select([data < bound for bound in _SECONDS_BOUNDS], _SECONDS_DIVISORS, 10 ** 9)
+    return data // divisors
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize json data, also the NaN and Infinity values written by the standard json module before."""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+
+def load_data_frame(path_or_buf: Union[Path, str, bytes]) -> pd.DataFrame:
+    """Load DataFrame from either string data or path.
+
+    Knowledge is parsed line by line with orjson, which is much faster than :func:`pandas.read_json`.
+    Knowledge is appended to, so only the last record of every id is kept, number of the superseded
+    records is available in ``stale_lines`` attribute of the DataFrame. The ``converted_dates`` attribute
+    is set if any dates were not stored in seconds, so the knowledge is rewritten on the next save.
+    """
+    if isinstance(path_or_buf, Path):
+        with open(path_or_buf, "rb") as f:
+            records = [loads(line) for line in f if line.strip()]
+    else:
+        records = [loads(line) for line in path_or_buf.splitlines() if line.strip()]
+
+    df = pd.DataFrame.from_records(records)
+    if df.empty:
+        return df
+
+    converted_dates = False
+    for column in df.columns:
+        data = df[column]
+        if (
+            _is_date_column(column)
+            and pd.api.types.is_numeric_dtype(data)
+            and (data.isna() | (data > _MIN_TIMESTAMP)).all()
+        ):
+            df[column] = pd.to_datetime(_to_seconds(data), unit="s")
+            converted_dates |= bool((data >= _SECONDS_BOUNDS[0]).any())
+
+    try:
+        df["id"] = df["id"].astype("int64")
+    except (TypeError, ValueError):
+        pass  # ids are not numeric, e.g. commit hashes or logins
+
+    df = df.set_index("id")
+    superseded = df.index.duplicated(keep="last")
+    df = df[~superseded]
+    df.attrs["stale_lines"] = int(superseded.sum())
+    df.attrs["converted_dates"] = converted_dates
     return df
 
 
 def load_json(path_or_buf: Union[Path, str]) -> Any:
     """Load json data from string or filepath."""
     if isinstance(path_or_buf, Path):
-        with open(path_or_buf, "r") as f:
-            return json.loads(f.read())
+        with open(path_or_buf, "rb") as f:
+            return loads(f.read())
 
-    return json.loads(path_or_buf)
+    return loads(path_or_buf)
 
 
 class KnowledgeStorage:
@@ -73,7 +158,7 @@ class KnowledgeStorage:
         location = os.getenv(StoragePath.LOCATION_VAR.value, StoragePath.DEFAULT.value)
         self.main = Path(location)
 
-        _LOGGER.debug("Use %s for knowledge loading and storing." % ("local" if is_local else "Ceph"))
+        _LOGGER.debug("Use %s for knowledge loading and storing.", "local" if is_local else "Ceph")
         _LOGGER.debug("Use %s as a main path for storage.", self.main)
 
     def get_ceph_store(self) -> CephStore:
@@ -92,17 +177,17 @@ class KnowledgeStorage:
             data {Dict[str, Any]} -- collected knowledge. Should be json compatible
 
         """
-        _LOGGER.info("Saving knowledge file %s of size %d" % (os.path.basename(file_path), len(data)))
+        _LOGGER.info("Saving knowledge file %s of size %d", os.path.basename(file_path), len(data))
 
         if not self.is_local:
             ceph_filename = os.path.relpath(file_path).replace("./", "")
             s3 = self.get_ceph_store()
             s3.store_document(data, ceph_filename)
-            _LOGGER.info("Saved on CEPH at %s/%s%s" % (s3.bucket, s3.prefix, ceph_filename))
+            _LOGGER.info("Saved on CEPH at %s/%s%s", s3.bucket, s3.prefix, ceph_filename)
         else:
-            with open(file_path, "w") as f:
-                json.dump(data, f)
-            _LOGGER.info("Saved locally at %s" % file_path)
+            with open(file_path, "wb") as f:
+                f.write(dumps(data))
+            _LOGGER.info("Saved locally at %s", file_path)
 
     def load_data(self, file_path: Optional[Path] = None, as_json: bool = False) -> pd.DataFrame:
         """Load previously collected repo knowledge. If a repo was not inspected before, create its directory.
@@ -128,7 +213,7 @@ class KnowledgeStorage:
             else self.load_remotely(file_path, as_json=as_json)
         )
 
-        _LOGGER.info("Data from file %s loaded")
+        _LOGGER.info("Data from file %s loaded", file_path)
         return results
 
     @staticmethod
@@ -137,7 +222,7 @@ class KnowledgeStorage:
         _LOGGER.info("Loading knowledge locally")
 
         if not file_path.exists():
-            _LOGGER.debug("Knowledge %s not found locally" % file_path)
+            _LOGGER.debug("Knowledge %s not found locally", file_path)
             return pd.DataFrame()
 
         if as_json:
@@ -156,5 +241,5 @@ class KnowledgeStorage:
             return data
 
         except NotFoundError:
-            _LOGGER.debug("Knowledge %s not found on Ceph" % ceph_filename)
+            _LOGGER.debug("Knowledge %s not found on Ceph", ceph_filename)
             return pd.DataFrame()
@@ -51,6 +51,7 @@ class StoragePath(Enum):
     KNOWLEDGE = "bot_knowledge"
     MERGE = "metrics"
     PROCESSED = "processed"
+    HTTP_CACHE = ".http_cache"
 
     KNOWLEDGE_PATH = DEFAULT + KNOWLEDGE
     MERGE_PATH = DEFAULT + MERGE
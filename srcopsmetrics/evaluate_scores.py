@@ -126,7 +126,7 @@ class ReviewerAssigner:
 
         for contributor in contributors:
 
-            _LOGGER.debug(f"Analyzing contributor: {contributor}")
+            _LOGGER.debug("Analyzing contributor: %s", contributor)
             if contributor in contributors_reviews_data.keys() and contributor not in BOTS_NAMES:
 
                 contributor_commits_number = sum(
@@ -312,5 +312,5 @@ class ReviewerAssigner:
         sorted_reviewers = contributors_score_data.sort_values(by=["Technical score"], ascending=False)
         _LOGGER.info(sorted_reviewers)
 
-        _LOGGER.info(f"Number of reviewers requested: {number_reviewer}")
-        _LOGGER.info(f"Reviewers: {sorted_reviewers['Contributor'].head(number_reviewer).values}")
+        _LOGGER.info("Number of reviewers requested: %d", number_reviewer)
+        _LOGGER.info("Reviewers: %s", sorted_reviewers["Contributor"].head(number_reviewer).values)
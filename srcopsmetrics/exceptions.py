@@ -30,3 +30,7 @@ class NotKnownEntitiesError(Exception):
         allowed = [e.__name__ for e in available_entities]
         unallowed = [e for e in specified_entities if e not in allowed]
         super().__init__("Invalid specified entities: %s", unallowed)
+
+
+class GraphQLQueryError(Exception):
+    """An exception when GitHub GraphQL API query returns errors."""
@@ -19,32 +19,74 @@
 
 import logging
 import os
+import threading
 import time
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Optional
+from urllib.parse import urlparse
 
+import requests
+import requests_cache
 from github import Github
 from github.Repository import Repository
 
+from srcopsmetrics import utils
+from srcopsmetrics.enums import StoragePath
+
 _LOGGER = logging.getLogger(__name__)
 
 _GITHUB_ACCESS_TOKEN = os.getenv("GITHUB_ACCESS_TOKEN")
 
 API_RATE_MINIMAL_REMAINING = 80
 GITHUB_TIMEOUT_SECONDS = 60
+HTTP_CACHE_EXPIRE_SECONDS = 3600
+GITHUB_API_HOST = "api.github.com"
+
+
+def _is_github_api_response(response: requests.Response) -> bool:
+    """Check whether response comes from GitHub API, only those are cached."""
+    return urlparse(response.url).hostname == GITHUB_API_HOST
+
+
+def install_http_cache():
+    """Cache GitHub API responses on disk under knowledge path.
+
+    Responses are stored together with their ETag, so once expired they are revalidated
+    with conditional requests. Not modified (304) responses do not count against the API rate limit.
+
+    The cache is installed for all of the requests sessions in the process, as PyGithub creates its own
+    session, but only GitHub API responses are stored. Rate limit headers of cached responses are stale,
+    so the remaining rate limit is always checked with the rate limit endpoint which is never cached.
+    """
+    path = Path(os.getenv(StoragePath.LOCATION_VAR.value, StoragePath.DEFAULT.value))
+    path = path.joinpath(StoragePath.KNOWLEDGE.value)
+    utils.check_directory(path)
+
+    requests_cache.install_cache(
+        cache_name=str(path.joinpath(StoragePath.HTTP_CACHE.value)),
+        backend="sqlite",
+        expire_after=HTTP_CACHE_EXPIRE_SECONDS,
+        urls_expire_after={f"{GITHUB_API_HOST}/rate_limit": requests_cache.DO_NOT_CACHE},
+        cache_control=True,
+        filter_fn=_is_github_api_response,
+    )
 
 
 class GitHubSingleton(object):
     """Singleton class for GitHub object."""
 
     _instance = None
+    _lock = threading.Lock()
 
     def __new__(cls):
         """One-time initialize GH object if there is none."""
-        if not cls._instance:
-            _LOGGER.debug("Initializing singleton GitHub wrapper object")
-            cls._instance = super(GitHubSingleton, cls).__new__(cls)
-            cls.github = Github(login_or_token=_GITHUB_ACCESS_TOKEN, timeout=GITHUB_TIMEOUT_SECONDS)
+        with cls._lock:
+            if not cls._instance:
+                _LOGGER.debug("Initializing singleton GitHub wrapper object")
+                install_http_cache()
+                cls.github = Github(login_or_token=_GITHUB_ACCESS_TOKEN, timeout=GITHUB_TIMEOUT_SECONDS)
+                cls._instance = super(GitHubSingleton, cls).__new__(cls)
 
         return cls._instance
 
@@ -55,7 +97,7 @@ class GithubHandler:
     def __init__(self, github: Optional[Github] = None):
         """Initialize with github object."""
         if not github:
-            github = Github(login_or_token=_GITHUB_ACCESS_TOKEN, timeout=GITHUB_TIMEOUT_SECONDS)
+            github = GitHubSingleton().github
 
         self.github = github
         self.remaining = github.get_rate_limit().core.remaining
@@ -73,7 +115,7 @@ class GithubHandler:
         wait_time = (gh_time - local_time.replace(tzinfo=None)).seconds
         wait_time += 60
 
-        _LOGGER.info("API rate limit REACHED, will now wait for %d minutes" % (wait_time // 60))
+        _LOGGER.info("API rate limit REACHED, will now wait for %d minutes", wait_time // 60)
         time.sleep(wait_time)
 
     def check_and_wait_for_api(self):
@@ -18,21 +18,18 @@
 """A base class for collecting bot knowledge from GitHub."""
 
 import logging
-import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Type
 
-from github import ContentFile, Github
+from github import ContentFile
 from github.Repository import Repository
 
 from srcopsmetrics.entities import Entity
-from srcopsmetrics.github_handling import GITHUB_TIMEOUT_SECONDS, github_handler
+from srcopsmetrics.github_handling import GitHubSingleton, github_handler
 from srcopsmetrics.iterator import KnowledgeAnalysis
 
 _LOGGER = logging.getLogger(__name__)
 
-_GITHUB_ACCESS_TOKEN = os.getenv("GITHUB_ACCESS_TOKEN")
-
 STANDALONE_LABELS = {"size"}
 
 
@@ -51,7 +48,7 @@ class GitHubKnowledge:
         :rtype: List of all repositories (repository + repositories in organization)
         """
         repos = []
-        gh = Github(login_or_token=_GITHUB_ACCESS_TOKEN, timeout=GITHUB_TIMEOUT_SECONDS)
+        gh = GitHubSingleton().github
 
         if repository is not None:
             repos.append(gh.get_repo(repository).full_name)
@@ -63,7 +60,7 @@ class GitHubKnowledge:
             for r in repositories:
                 repos.append(r.full_name)
 
-        _LOGGER.info("Overall repositories found: %d" % len(repos))
+        _LOGGER.info("Overall repositories found: %d", len(repos))
         return repos
 
     def store_content_file(self, file_content: ContentFile, results: Dict[str, Dict[str, Any]]):
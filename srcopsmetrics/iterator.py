@@ -17,18 +17,22 @@
 
 """Used to iterate through all entities from repository."""
 
+import asyncio
 import logging
 import os
+import threading
 import time
 from datetime import datetime, timezone
+from typing import Sized
 
-from github import Github
+import aiohttp
 from github.GithubException import GithubException
 from github.PaginatedList import PaginatedList
 from tqdm import tqdm
 
 from srcopsmetrics.entities import Entity
-from srcopsmetrics.github_handling import GithubHandler
+from srcopsmetrics.exceptions import GraphQLQueryError
+from srcopsmetrics.github_handling import GithubHandler, GitHubSingleton
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,6 +49,9 @@ class KnowledgeAnalysis:
     _HOST = os.getenv("S3_ENDPOINT_URL")
     _BUCKET = os.getenv("CEPH_BUCKET")
 
+    # set when analysis running in other threads is interrupted, they stop and save what was analysed so far
+    interrupted = threading.Event()
+
     def __init__(
         self,
         entity: Entity,
@@ -54,7 +61,7 @@ class KnowledgeAnalysis:
         self.entity = entity
         self.knowledge_updated = False
         self.is_local = is_local
-        self.github = Github(self._GITHUB_ACCESS_TOKEN)
+        self.github = GitHubSingleton().github
         self.handler = GithubHandler(self.github)
 
     def __enter__(self):
@@ -78,19 +85,27 @@ class KnowledgeAnalysis:
         wait_time = (gh_time - local_time.replace(tzinfo=None)).seconds
         wait_time += 60
 
-        _LOGGER.info("API rate limit REACHED, will now wait for %d minutes" % (wait_time // 60))
+        _LOGGER.info("API rate limit REACHED, will now wait for %d minutes", wait_time // 60)
         time.sleep(wait_time)
 
     def run(self):
         """Iterate through entities of given repository and accumulate them."""
-        _LOGGER.info("-------------%s Analysis-------------" % self.entity.name())
+        _LOGGER.info("-------------%s Analysis-------------", self.entity.name())
 
         try:
             entities = self.entity.analyse()
-            length = entities.totalCount if isinstance(entities, PaginatedList) else len(entities)
+
+            length = None  # entities fetched lazily are of unknown length
+            if isinstance(entities, PaginatedList):
+                length = entities.totalCount
+            elif isinstance(entities, Sized):
+                length = len(entities)
 
             progressbar = tqdm(entities, total=length)
             for idx, entity in enumerate(progressbar, 1):
+                if self.interrupted.is_set():
+                    raise KeyboardInterrupt("Analysis interrupted")
+
                 self.knowledge_updated = True
 
                 self.handler.check_and_wait_for_api()
@@ -98,7 +113,7 @@ class KnowledgeAnalysis:
 
                 self.entity.store(entity)
 
-        except (GithubException, KeyboardInterrupt) as e:
+        except (GithubException, aiohttp.ClientError, asyncio.TimeoutError, GraphQLQueryError, KeyboardInterrupt) as e:
             _LOGGER.warning(str(e))
             _LOGGER.warning("Problem occured, cached data will be saved")
 
@@ -18,7 +18,6 @@
 """Kebechet repository metrics evaluation."""
 
 import logging
-import os
 import time
 from datetime import date
 from pathlib import Path
@@ -26,12 +25,12 @@ from typing import Any, Dict, Optional
 
 import numpy as np
 import pandas as pd
-from github import Github
 
 from srcopsmetrics import utils
 from srcopsmetrics.entities.issue import Issue
 from srcopsmetrics.entities.pull_request import PullRequest
 from srcopsmetrics.entities.tools.storage import KnowledgeStorage
+from srcopsmetrics.github_handling import GitHubSingleton
 from srcopsmetrics.storage import get_merge_path
 
 BOT_NAMES = {"sesheta"}
@@ -44,7 +43,6 @@ UPDATE_TYPES_AND_KEYWORDS = {
 }
 
 _LOGGER = logging.getLogger(__name__)
-_GITHUB_ACCESS_TOKEN = os.getenv("GITHUB_ACCESS_TOKEN")
 
 
 def get_update_manager_request_type(title: str) -> Optional[str]:
@@ -64,7 +62,7 @@ class KebechetMetrics:
 
     def __init__(self, repository: str, is_local: bool = False, day: Optional[date] = None):
         """Initialize with collected knowledge."""
-        gh_repo = Github(login_or_token=_GITHUB_ACCESS_TOKEN, timeout=50).get_repo(repository)
+        gh_repo = GitHubSingleton().github.get_repo(repository)
 
         self.repo_name = repository
         self.prs = PullRequest(gh_repo).load_previous_knowledge(is_local=is_local)
@@ -18,7 +18,6 @@
 
 """Metrics for MI."""
 
-import os
 from datetime import datetime
 from pathlib import Path
 
@@ -28,25 +27,23 @@ import logging
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from github import Github
 
 from srcopsmetrics.entities.issue import Issue
 from srcopsmetrics.entities.pull_request import PullRequest
+from srcopsmetrics.github_handling import GitHubSingleton
 from srcopsmetrics.utils import check_directory
 
 from typing import Dict
 
 _LOGGER = logging.getLogger(__name__)
 
-_GITHUB_ACCESS_TOKEN = os.getenv("GITHUB_ACCESS_TOKEN")
-
 
 class Metrics:
     """Metrics used in MI."""
 
     def __init__(self, repository: str, visualize: bool = False):
         """Initialize with collected knowledge."""
-        self.gh_repo = Github(login_or_token=_GITHUB_ACCESS_TOKEN, timeout=50).get_repo(repository)
+        self.gh_repo = GitHubSingleton().github.get_repo(repository)
 
         self.repo_name = repository
         self.prs = PullRequest(self.gh_repo).load_previous_knowledge(is_local=True)
@@ -148,7 +145,7 @@ class Metrics:
 
                 diff = abs(median - int(outliers.loc[idx, metric]))
 
-                _LOGGER.info("PR #%d is %d above %s median (%s)" % (pr_id, diff, metric, gh_pr.html_url))
+                _LOGGER.info("PR #%d is %d above %s median (%s)", pr_id, diff, metric, gh_pr.html_url)
 
     def get_metrics_outliers_issues(self, filter_closed: bool = True):
         """Get outliers for every Issue metric."""
@@ -172,7 +169,7 @@ class Metrics:
 
                 diff = abs(median - int(outliers.loc[idx, metric]))
 
-                _LOGGER.info("Issue #%d is %d above %s median (%s)" % (issue_id, diff, metric, gh_pr.html_url))
+                _LOGGER.info("Issue #%d is %d above %s median (%s)", issue_id, diff, metric, gh_pr.html_url)
 
     def save_graph_for_metrics(self, entity, metrics_name: str, time_metrics_name: str):
         """Save graph for known metrics, time metrics and their scores."""
@@ -17,17 +17,18 @@
 
 """GitHub Knowledge Storage handling."""
 
-import json
 import logging
 import os
 from functools import partial
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import orjson
 from thoth.storages.ceph import CephStore
 from thoth.storages.exceptions import NotFoundError
 
 from srcopsmetrics import utils
+from srcopsmetrics.entities.tools.storage import loads
 from srcopsmetrics.enums import StoragePath
 
 _LOGGER = logging.getLogger(__name__)
@@ -109,7 +110,7 @@ class KnowledgeStorage:
         location = os.getenv(StoragePath.LOCATION_VAR.value, StoragePath.DEFAULT.value)
         self.main = Path(location)
 
-        _LOGGER.debug("Use %s for knowledge loading and storing." % ("local" if is_local else "Ceph"))
+        _LOGGER.debug("Use %s for knowledge loading and storing.", "local" if is_local else "Ceph")
         _LOGGER.debug("Use %s as a main path for storage.", self.main)
 
     def get_ceph_store(self) -> CephStore:
@@ -133,17 +134,17 @@ class KnowledgeStorage:
         """
         results = {"results": data}
 
-        _LOGGER.info("Saving knowledge file %s of size %d" % (os.path.basename(file_path), len(data)))
+        _LOGGER.info("Saving knowledge file %s of size %d", os.path.basename(file_path), len(data))
 
         if not self.is_local:
             ceph_filename = os.path.relpath(file_path).replace("./", "")
             s3 = self.get_ceph_store()
             s3.store_document(results, ceph_filename)
-            _LOGGER.info("Saved on CEPH at %s/%s%s" % (s3.bucket, s3.prefix, ceph_filename))
+            _LOGGER.info("Saved on CEPH at %s/%s%s", s3.bucket, s3.prefix, ceph_filename)
         else:
-            with open(file_path, "w") as f:
-                json.dump(results, f)
-            _LOGGER.info("Saved locally at %s" % file_path)
+            with open(file_path, "wb") as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_SERIALIZE_NUMPY))
+            _LOGGER.info("Saved locally at %s", file_path)
 
     def load_previous_knowledge(
         self, project_name: str = None, knowledge_type: str = None, file_path: Optional[Path] = None
@@ -172,12 +173,14 @@ class KnowledgeStorage:
         results = self.load_locally(file_path) if self.is_local else self.load_remotely(file_path)
 
         if results is None:
-            _LOGGER.info("No previous knowledge of type %s found" % knowledge_type)
+            _LOGGER.info("No previous knowledge of type %s found", knowledge_type)
             results = {}
         else:
             _LOGGER.info(
-                "Found previous knowledge for %s with %d entities of type %s"
-                % (project_name, len(results), knowledge_type)
+                "Found previous knowledge for %s with %d entities of type %s",
+                project_name,
+                len(results),
+                knowledge_type,
             )
         return results
 
@@ -186,10 +189,10 @@ class KnowledgeStorage:
         """Load knowledge file from local storage."""
         _LOGGER.info("Loading knowledge locally")
         if not file_path.exists() or os.path.getsize(file_path) == 0:
-            _LOGGER.debug("Knowledge %s not found locally" % file_path)
+            _LOGGER.debug("Knowledge %s not found locally", file_path)
             return None
-        with open(file_path, "r") as f:
-            data = json.load(f)
+        with open(file_path, "rb") as f:
+            data = loads(f.read())
         return data
 
     def load_remotely(self, file_path: Path) -> Optional[Dict[str, Any]]:
@@ -199,5 +202,5 @@ class KnowledgeStorage:
         try:
             return self.get_ceph_store().retrieve_document(ceph_filename)
         except NotFoundError:
-            _LOGGER.debug("Knowledge %s not found on Ceph" % file_path)
+            _LOGGER.debug("Knowledge %s not found on Ceph", file_path)
             return None
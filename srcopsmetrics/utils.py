@@ -34,15 +34,15 @@ _LOGGER = logging.getLogger(__name__)
 def check_directory(knowledge_dir: Path):
     """Check if directory exists. If not, create one."""
     if not knowledge_dir.exists():
-        _LOGGER.info("No repo identified, creating new directory at %s" % knowledge_dir)
-        os.makedirs(knowledge_dir)
+        _LOGGER.info("No repo identified, creating new directory at %s", knowledge_dir)
+        os.makedirs(knowledge_dir, exist_ok=True)
 
 
 def remove_previously_processed(project_name: str):
     """Remove processed information for whole project."""
     print(project_name)
     path = Path(StoragePath.PROCESSED.value).joinpath(project_name)
-    _LOGGER.info("Cleaning processed knowledge at %s" % project_name)
+    _LOGGER.info("Cleaning processed knowledge at %s", project_name)
     if os.path.isdir(path) and not os.path.islink(path):
         shutil.rmtree(path)
     elif os.path.exists(path):
@@ -108,6 +108,6 @@ def convert_num2label(score: float) -> Tuple[str, float]:
         assigned_score = np.mean([0.01, 0.02])
 
     else:
-        _LOGGER.error("%s cannot be mapped, it's out of range [%f, %f]." % (score, 0.01, 0.9))
+        _LOGGER.error("%s cannot be mapped, it's out of range [%f, %f].", score, 0.01, 0.9)
 
     return pull_request_size, assigned_score